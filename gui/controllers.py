@@ -13,7 +13,7 @@ from PyQt6.QtWidgets import QApplication
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.search import search_manga, get_manga_details
-from src.downloader import ChapterDownloader, fetch_chapter_image_urls, get_chapter_list, close_driver
+from src.downloader import ChapterDownloader, fetch_chapter_image_urls, get_chapter_list, release_driver
 from src.converter import convert_manga_chapters
 from src.models import Manga, Chapter, SearchResult, DownloadResult
 from src.utils import sanitize_filename
@@ -74,7 +74,7 @@ class ChapterListWorker(QThread):
             self.chapters_failed.emit(str(e))
         finally:
             if self.driver:
-                close_driver(self.driver)
+                release_driver(self.driver)
 
 
 class ImageUrlsWorker(QThread):
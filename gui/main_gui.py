@@ -16,6 +16,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 from gui.main_window import MainWindow
+from src.downloader import shutdown_drivers
 from gui.styles import style_manager
 
 
@@ -83,9 +84,9 @@ def check_dependencies() -> Optional[str]:
         missing_deps.append("httpx")
     
     try:
-        import bs4
+        import selectolax
     except ImportError:
-        missing_deps.append("beautifulsoup4")
+        missing_deps.append("selectolax")
     
     try:
         from selenium import webdriver
@@ -210,6 +211,8 @@ def main():
     except Exception as e:
         logger.error(f"Application error: {str(e)}", exc_info=True)
         return 1
+    finally:
+        shutdown_drivers()
 
 
 if __name__ == "__main__":
@@ -3,12 +3,40 @@ Worker threads for handling background tasks in the GUI.
 """
 import sys
 import os
+import threading
 from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, pyqtSlot
 import httpx
 
 # Add src to path to import existing modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from src.utils import get_headers
+from src.utils import KEEPALIVE_EXPIRY, get_headers
+
+
+# Cover images are fetched through one shared client so connections are reused
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    """Return the shared HTTP client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                headers=get_headers(),
+                follow_redirects=True,
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    retries=3,
+                    # httpx's default pool caps, which a Limits with only keepalive_expiry would drop
+                    limits=httpx.Limits(
+                        max_connections=100,
+                        max_keepalive_connections=20,
+                        keepalive_expiry=KEEPALIVE_EXPIRY
+                    )
+                )
+            )
+        return _client
 
 
 class WorkerSignals(QObject):
@@ -27,10 +55,9 @@ class ImageDownloader(QRunnable):
     @pyqtSlot()
     def run(self):
         try:
-            with httpx.Client(headers=get_headers()) as client:
-                response = client.get(self.url, timeout=20)
-                response.raise_for_status()
-                self.signals.result.emit(response.content)
+            response = _get_client().get(self.url, timeout=20)
+            response.raise_for_status()
+            self.signals.result.emit(response.content)
         except Exception as e:
             self.signals.error.emit((e,))
         finally:
@@ -2,14 +2,27 @@
 Conversion functionality for the Mangago Downloader.
 Supports converting downloaded manga images to PDF and CBZ formats.
 """
+import multiprocessing
 import os
+import shutil
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Optional
 import img2pdf
 from PIL import Image
 
 
+# File extensions recognised as chapter images
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff')
+
+# Number of threads used to read chapter images before building a PDF
+PDF_READ_WORKERS = 16
+
+# Compression level used when a compressed CBZ is requested
+CBZ_COMPRESS_LEVEL = 1
+
+
 def convert_to_pdf(
     chapter_dir: str,
     output_path: Optional[str] = None,
@@ -24,15 +37,17 @@ def convert_to_pdf(
             print(f"No images found in {chapter_dir}")
             return None
         
-        image_files.sort()
-        
         if not output_path:
             chapter_name = os.path.basename(chapter_dir)
             output_path = os.path.join(chapter_dir, f"{chapter_name}.pdf")
         
+        # Read the images concurrently so slow storage doesn't serialize on each file
+        with ThreadPoolExecutor(max_workers=PDF_READ_WORKERS) as executor:
+            image_data = list(executor.map(_read_file, image_files))
+        
         # By passing the raw image data, img2pdf avoids re-encoding and preserves quality.
         with open(output_path, "wb") as f:
-            f.write(img2pdf.convert([open(i, "rb").read() for i in image_files]))
+            f.write(img2pdf.convert(image_data))
         
         if delete_images:
             for image_file in image_files:
@@ -50,10 +65,13 @@ def convert_to_pdf(
 def convert_to_cbz(
     chapter_dir: str,
     output_path: Optional[str] = None,
-    delete_images: bool = False
+    delete_images: bool = False,
+    compress: bool = False
 ) -> Optional[str]:
     """
     Convert chapter images to CBZ (Comic Book ZIP).
+    Images are stored uncompressed by default, since JPEG/PNG/WebP data
+    gains almost nothing from deflate; pass compress=True to deflate anyway.
     """
     try:
         image_files = _get_image_files(chapter_dir)
@@ -61,16 +79,21 @@ def convert_to_cbz(
             print(f"No images found in {chapter_dir}")
             return None
         
-        image_files.sort()
-        
         if not output_path:
             chapter_name = os.path.basename(chapter_dir)
             output_path = os.path.join(chapter_dir, f"{chapter_name}.cbz")
         
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        if compress:
+            compression, compresslevel = zipfile.ZIP_DEFLATED, CBZ_COMPRESS_LEVEL
+        else:
+            compression, compresslevel = zipfile.ZIP_STORED, None
+        
+        with open(output_path, 'wb', buffering=1 << 20) as archive, \
+                zipfile.ZipFile(archive, 'w', compression, allowZip64=True, compresslevel=compresslevel) as zipf:
             for image_file in image_files:
                 arcname = os.path.basename(image_file)
-                zipf.write(image_file, arcname)
+                with open(image_file, 'rb') as src, zipf.open(arcname, 'w') as dst:
+                    shutil.copyfileobj(src, dst, length=1 << 20)
         
         if delete_images:
             for image_file in image_files:
@@ -93,50 +116,78 @@ def convert_manga_chapters(
     """
     Convert all chapters of a manga to the specified format.
     """
-    created_files = []
+    if format.lower() not in ("pdf", "cbz"):
+        print(f"Unsupported format: {format}")
+        return []
     
     try:
-        chapter_dirs = [os.path.join(manga_dir, item) for item in os.listdir(manga_dir) if os.path.isdir(os.path.join(manga_dir, item))]
+        with os.scandir(manga_dir) as entries:
+            chapter_dirs = [entry.path for entry in entries if entry.is_dir()]
     except FileNotFoundError:
         print(f"Error: Manga directory not found at {manga_dir}")
         return []
     
+    if not chapter_dirs:
+        return []
+    
     chapter_dirs.sort()
+    outputs = {}
     
-    for chapter_dir in chapter_dirs:
-        try:
-            if format.lower() == "pdf":
-                output_file = convert_to_pdf(chapter_dir, delete_images=delete_images)
-            elif format.lower() == "cbz":
-                output_file = convert_to_cbz(chapter_dir, delete_images=delete_images)
-            else:
-                print(f"Unsupported format: {format}")
-                continue
-            
-            if output_file:
-                created_files.append(output_file)
-                print(f"Converted {os.path.basename(chapter_dir)} to {os.path.basename(output_file)}")
-        except Exception as e:
-            print(f"Error converting {os.path.basename(chapter_dir)}: {e}")
+    # Chapters share no state, so each one is converted in its own process. Workers are
+    # spawned rather than forked, since callers like the GUI run other threads whose locks
+    # a forked child would inherit mid-use.
+    max_workers = min(len(chapter_dirs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        future_to_dir = {
+            executor.submit(_convert_one, chapter_dir, format, delete_images): chapter_dir
+            for chapter_dir in chapter_dirs
+        }
+        for future in as_completed(future_to_dir):
+            chapter_dir = future_to_dir[future]
+            try:
+                output_file = future.result()
+                if output_file:
+                    outputs[chapter_dir] = output_file
+                    print(f"Converted {os.path.basename(chapter_dir)} to {os.path.basename(output_file)}")
+            except Exception as e:
+                print(f"Error converting {os.path.basename(chapter_dir)}: {e}")
     
-    return created_files
+    return [outputs[d] for d in chapter_dirs if d in outputs]
+
+
+def _convert_one(chapter_dir: str, format: str, delete_images: bool) -> Optional[str]:
+    """
+    Convert a single chapter; module-level so it can be sent to worker processes.
+    """
+    if format.lower() == "pdf":
+        return convert_to_pdf(chapter_dir, delete_images=delete_images)
+    return convert_to_cbz(chapter_dir, delete_images=delete_images)
+
+
+def _read_file(path: str) -> bytes:
+    """
+    Read a file's full contents.
+    """
+    with open(path, "rb") as f:
+        return f.read()
 
 
 def _get_image_files(directory: str) -> List[str]:
     """
     Get all image files in a directory, sorted numerically.
     """
-    image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff'}
-    image_files = []
+    pairs = []
     
     try:
-        for filename in os.listdir(directory):
-            if os.path.splitext(filename)[1].lower() in image_extensions:
-                image_files.append(os.path.join(directory, filename))
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_file() and name.lower().endswith(IMAGE_EXTENSIONS):
+                    # Numeric key (e.g., 1.jpg, 2.jpg, 10.jpg); non-numeric names sort first
+                    stem = name.rsplit('.', 1)[0]
+                    pairs.append((int(stem) if stem.isdigit() else -1, entry.path))
     except FileNotFoundError:
         print(f"Directory not found: {directory}")
 
-    # Sort numerically based on filename (e.g., 1.jpg, 2.jpg, 10.jpg)
-    image_files.sort(key=lambda f: int(os.path.splitext(os.path.basename(f))[0]))
-    
-    return image_files
\ No newline at end of file
+    pairs.sort()
+    return [path for _, path in pairs]
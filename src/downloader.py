@@ -1,26 +1,83 @@
 """
 Downloader engine with threading support for the Mangago Downloader.
 """
+import asyncio
+import json
 import os
+import queue
 import re
 import threading
 import time
+from contextlib import contextmanager
+from itertools import islice
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
 import httpx
-import requests # Import requests
-from bs4 import BeautifulSoup, Tag
+from selectolax.lexbor import LexborHTMLParser
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
 from .models import Chapter, Manga, DownloadResult
-from .utils import SessionManager, NetworkError, ParsingError, DownloadError, create_directory, sanitize_filename
+from .utils import (
+    AsyncSessionManager, NetworkError, ParsingError, DownloadError,
+    get_default_session, get_headers, sanitize_filename
+)
+
+
+# Patterns used when parsing chapter lists
+_RE_CH = re.compile(r'Ch\.(\d+(?:\.\d+)?)')
+_RE_CH_TITLE = re.compile(r'Chapter\s*(\d+(?:\.\d+)?)', re.IGNORECASE)
+_RE_CH_HREF = re.compile(r'/chapter/\d+/\d+/')
+_RE_CH_HREF_NUM = re.compile(r'/chapter/\d+/(\d+)/')
+
+# Patterns used when walking chapter pages
+_RE_PG = re.compile(r'pg-\d+')
+_RE_PG_NUM = re.compile(r'pg-(\d+)')
+_RE_CHAPTER_ID = re.compile(r'chapter/\d+/(\d+)/')
+_RE_UU = re.compile(r'(.*/pg-)\d+')
+_RE_MH = re.compile(r'(.*/c\d+/)')
+_RE_MH_PAGE = re.compile(r'/c\d+/(\d+)')
+
+# Image lists embedded in chapter pages, either as a JSON array or a comma-separated string
+_RE_IMGSRCS_ARRAY = re.compile(r"var imgsrcs\s*=\s*(\[[^\]]+\])")
+_RE_IMGSRCS_STRING = re.compile(r"var imgsrcs\s*=\s*['\"]([^'\"]+)['\"]")
+
+# Number of /uu/ and /mh/ chapter pages requested at once. The last batch overshoots the
+# chapter; those pages come back without an image, as a 4xx or as a redirect, and are discarded.
+MH_PAGE_BATCH = 8
+
+# Domains whose image CDN expects the fixed mangago.zone referer and a browser user agent
+MANGAGO_DOMAINS = ["www.youhim.me", "www.mangago.zone", "www.mangago.me"]
+
+
+# O_BINARY keeps Windows from translating newlines; O_CLOEXEC keeps the fd out of child processes
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+
+async def _write_chunks(path: str, chunks: AsyncIterator[bytes]):
+    """
+    Write streamed chunks to `path + ".part"` and rename it into place once complete,
+    so an interrupted download never leaves a truncated image under the final name.
+    """
+    part_path = path + ".part"
+    fd = os.open(part_path, _WRITE_FLAGS, 0o644)
+    try:
+        async for chunk in chunks:
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view):]
+    except BaseException:
+        os.close(fd)
+        os.remove(part_path)
+        raise
+    os.close(fd)
+    os.replace(part_path, path)
 
 
 class ChapterDownloader:
@@ -28,27 +85,53 @@ class ChapterDownloader:
     Handles downloading of manga chapters with threading support.
     """
     
-    def __init__(self, max_workers: int = 5, download_dir: str = "downloads"):
+    def __init__(self, max_workers: int = 5, download_dir: str = "downloads", images_per_chapter: int = 8,
+                 max_connections: int = 256, max_keepalive: int = 64):
         self.max_workers = max_workers
         self.download_dir = download_dir
-        self.session = SessionManager()
+        # Connection pool bounds for the shared image session
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        # Cap on concurrent image requests per chapter, so one long chapter can't starve the others
+        self.images_per_chapter = images_per_chapter
+        # Image downloads share one event loop thread and one HTTP/2 client,
+        # so connections stay open across every chapter of the run
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._session: Optional[AsyncSessionManager] = None
+        # One user agent for the downloader's whole run instead of a new one per chapter
+        self._headers = get_headers()
         
-    def download_chapter(self, manga: Manga, chapter: Chapter) -> DownloadResult:
-        if not chapter.image_urls:
+    def download_chapter(self, manga: Manga, chapter: Chapter, manga_dir: Optional[str] = None) -> DownloadResult:
+        # Rebuilt from the chapter's shared prefix on each access, so read it once
+        image_urls = chapter.image_urls
+        if not image_urls:
             return DownloadResult(chapter=chapter, success=False, error_message="No image URLs found.")
 
-        manga_dir = os.path.join(self.download_dir, sanitize_filename(manga.title))
-        create_directory(manga_dir)
+        if manga_dir is None:
+            manga_dir = self._manga_dir(manga)
         
         chapter_dir = os.path.join(manga_dir, f"Chapter_{chapter.number}")
-        create_directory(chapter_dir)
+        os.makedirs(chapter_dir, exist_ok=True)
+        
+        # One directory listing instead of a stat per image when resuming
+        with os.scandir(chapter_dir) as entries:
+            existing = {entry.name for entry in entries}
         
-        downloaded_count = 0
-        for i, image_url in enumerate(chapter.image_urls, start=1):
+        pending_urls, pending_paths = [], []
+        for i, image_url in enumerate(image_urls, start=1):
             image_filename = f"{i:03d}.jpg"
-            image_path = os.path.join(chapter_dir, image_filename)
-            if self._download_image(image_url, image_path, chapter.url): # Pass chapter.url as referer
-                downloaded_count += 1
+            if image_filename in existing:
+                continue
+            pending_urls.append(image_url)
+            pending_paths.append(os.path.join(chapter_dir, image_filename))
+        
+        downloaded_count = len(image_urls) - len(pending_urls)
+        if pending_urls:
+            downloaded_count += self._run(
+                self._download_images_async(pending_urls, pending_paths, chapter.url) # Pass chapter.url as referer
+            )
         
         return DownloadResult(
             chapter=chapter,
@@ -58,42 +141,105 @@ class ChapterDownloader:
         )
     
     def download_chapters(self, manga: Manga, chapters: List[Chapter]) -> List[DownloadResult]:
-        results = []
+        manga_dir = self._manga_dir(manga)
+        
+        # Results are stored by index so they come back in the same order as `chapters`
+        results: List[Optional[DownloadResult]] = [None] * len(chapters)
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_chapter = {executor.submit(self.download_chapter, manga, chapter): chapter for chapter in chapters}
-            for future in as_completed(future_to_chapter):
-                results.append(future.result())
+            future_to_index = {executor.submit(self.download_chapter, manga, chapter, manga_dir): i for i, chapter in enumerate(chapters)}
+            for future in as_completed(future_to_index):
+                results[future_to_index[future]] = future.result()
         return results
     
-    def _download_image(self, image_url: str, image_path: str, chapter_referer: str) -> bool: # Add chapter_referer parameter
-        try:
-            if os.path.exists(image_path):
-                return True
-            # Determine the Referer based on the chapter_referer's domain
-            parsed_chapter_referer = urlparse(chapter_referer)
-            chapter_domain = parsed_chapter_referer.netloc
-
-            if chapter_domain in ["www.youhim.me", "www.mangago.zone", "www.mangago.me"]:
-                # Use requests for these specific domains with hardcoded referer
-                headers = {
-                    "Referer": "https://www.mangago.zone/",
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                                  "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                }
-                response = requests.get(image_url, headers=headers, timeout=30)
-            else:
-                # Fallback to httpx for other domains
-                referer_to_use = chapter_referer # Or parsed_image_url.scheme + "://" + parsed_image_url.netloc + "/"
-                response = self.session.get(image_url, headers={"Referer": referer_to_use}, timeout=20)
-            response.raise_for_status()
-            with open(image_path, 'wb') as f:
-                f.write(response.content)
-            return True
-        except Exception:
-            return False
+    def _manga_dir(self, manga: Manga) -> str:
+        """
+        Build and create the download directory for a manga.
+        """
+        manga_dir = os.path.join(self.download_dir, sanitize_filename(manga.title))
+        os.makedirs(manga_dir, exist_ok=True)
+        return manga_dir
+    
+    def _run(self, coro):
+        """
+        Run a coroutine on the downloader's event loop thread and wait for its result.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+                self._loop_thread.start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    def _get_session(self) -> AsyncSessionManager:
+        # Only called from the event loop thread. Image requests carry their own headers.
+        if self._session is None:
+            self._session = AsyncSessionManager(
+                headers={},
+                max_connections=self.max_connections,
+                max_keepalive=self.max_keepalive
+            )
+        return self._session
+    
+    async def _download_images_async(self, image_urls: List[str], image_paths: List[str], chapter_referer: str) -> int:
+        """
+        Download all images of a chapter concurrently over the shared HTTP/2 session.
+        
+        Returns:
+            int: The number of images downloaded successfully.
+        """
+        session = self._get_session()
+        headers = self._image_headers(chapter_referer)
+        limit = asyncio.Semaphore(self.images_per_chapter)
+        results = await asyncio.gather(*(
+            self._fetch_image(session, image_url, image_path, headers, limit)
+            for image_url, image_path in zip(image_urls, image_paths)
+        ))
+        return sum(results)
+    
+    async def _fetch_image(self, session: AsyncSessionManager, image_url: str, image_path: str,
+                           headers: Dict[str, str], limit: asyncio.Semaphore) -> bool:
+        async def send() -> httpx.Response:
+            async with session.stream("GET", image_url, headers=headers) as response:
+                if response.is_success:
+                    # Chunks are written as they arrive from the socket; asking httpx for a
+                    # fixed chunk size would copy every body through an extra buffer
+                    await _write_chunks(image_path, response.aiter_bytes())
+                return response
+
+        async with limit:
+            # Retried by the session, so one flaky image doesn't fail the whole chapter
+            try:
+                response = await session.send_with_retries(send)
+            except Exception:
+                return False
+            return response.is_success
+    
+    def _image_headers(self, chapter_referer: str) -> Dict[str, str]:
+        # Determine the Referer based on the chapter_referer's domain
+        chapter_domain = urlparse(chapter_referer).netloc
+
+        if chapter_domain in MANGAGO_DOMAINS:
+            # These domains need a hardcoded referer
+            return {
+                "Referer": "https://www.mangago.zone/",
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+            }
+        return {**self._headers, "Referer": chapter_referer}
     
     def close(self):
-        self.session.close()
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result()
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop_thread.join()
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
 
 
 def _replace_page_number_manhwa(url: str, page_number: int) -> str:
@@ -107,16 +253,87 @@ def _replace_page_number_manhwa(url: str, page_number: int) -> str:
     Returns:
         str: The URL with the updated page number
     """
-    import re
     # Replace pg-X with pg-page_number
-    return re.sub(r'pg-\d+', f'pg-{page_number}', url)
+    return _RE_PG.sub(f'pg-{page_number}', url)
 
 def extract_chapter_id(url):
-    match = re.search(r"chapter/\d+/(\d+)/", url)
+    match = _RE_CHAPTER_ID.search(url)
     if match:
         return match.group(1)
     return None
 
+# Domains whose chapter pages don't expose a plain image list, so the HTTP path is skipped
+_http_unsupported_domains = set()
+
+def _parse_imgsrcs(html: str) -> Optional[List[str]]:
+    """
+    Parse the image list embedded in a chapter page's scripts.
+    
+    Returns:
+        Optional[List[str]]: The image URLs, or None if the page has no plain list
+        (for example when the list is encrypted and decoded by JavaScript).
+    """
+    match = _RE_IMGSRCS_ARRAY.search(html)
+    if match:
+        try:
+            urls = json.loads(match.group(1))
+        except ValueError:
+            return None
+    else:
+        match = _RE_IMGSRCS_STRING.search(html)
+        if not match:
+            return None
+        urls = match.group(1).split(",")
+
+    urls = [url.strip() for url in urls if isinstance(url, str) and url.strip()]
+    if not urls or not all(url.startswith("http") for url in urls):
+        return None
+    return urls
+
+
+def fetch_chapter_image_urls_http(chapter_url: str) -> Optional[List[str]]:
+    """
+    Extract a chapter's image URLs from its HTML without starting a browser.
+    Follows the chapter's subpages the same way the Selenium path does.
+    
+    Returns:
+        Optional[List[str]]: The image URLs, or None if any page couldn't be parsed.
+        
+    Raises:
+        httpx.HTTPError: If a page couldn't be fetched.
+    """
+    session = get_default_session()
+    img_urls = []
+    current_url = chapter_url
+    visited = set()
+
+    while current_url not in visited:
+        visited.add(current_url)
+        response = session.get(current_url, headers={"Referer": chapter_url})
+        response.raise_for_status()
+
+        html = response.text
+        srcs = _parse_imgsrcs(html)
+        if srcs is None:
+            return None
+        img_urls.extend(srcs)
+
+        next_link = LexborHTMLParser(html).css_first("a.next_page")
+        href = next_link.attributes.get("href") if next_link else None
+        if not href:
+            break
+
+        page_url = str(response.url)
+        next_url = urljoin(page_url, href)
+        current_chapter_id = extract_chapter_id(page_url)
+        next_chapter_id = extract_chapter_id(next_url)
+        if current_chapter_id and next_chapter_id and current_chapter_id != next_chapter_id:
+            break
+        current_url = next_url
+
+    return img_urls or None
+
+
 def fetch_chapter_image_urls(chapter_url: str) -> List[str]:
     """
     Extract all image URLs from a paginated chapter.
@@ -131,9 +348,19 @@ def fetch_chapter_image_urls(chapter_url: str) -> List[str]:
     img_urls = []
 
     if domain in ["www.youhim.me", "www.mangago.zone"]:
-        driver = None
-        try:
-            driver = init_driver()
+        # A plain HTTP fetch is far cheaper than scrolling a browser, when the page allows it
+        if domain not in _http_unsupported_domains:
+            try:
+                http_urls = fetch_chapter_image_urls_http(chapter_url)
+            except httpx.HTTPError:
+                # A network error says nothing about the page format; only this chapter uses Selenium
+                pass
+            else:
+                if http_urls:
+                    return http_urls
+                _http_unsupported_domains.add(domain)
+
+        with SCROLL_DRIVERS.acquire() as driver:
             current_url = chapter_url
             subpage_idx = 1 # Not strictly needed for img_urls, but good for debugging
 
@@ -144,26 +371,23 @@ def fetch_chapter_image_urls(chapter_url: str) -> List[str]:
                 wait_first_image(driver, timeout=25)
 
                 # Scroll until all lazy images are in DOM
-                imgs = load_all_images_on_subpage(driver, initial_wait=10, pause=1.2, max_rounds=500, stable_rounds=3)
+                srcs = load_all_images_on_subpage(driver, initial_wait=10, pause=1.2, max_rounds=500, stable_rounds=3)
 
                 # Add images from current subpage to list
-                for img in sorted(imgs, key=sort_key_by_page_id):
-                    src = img.get_attribute("src") or img.get_attribute("data-src")
-                    if src:
-                        img_urls.append(src)
+                img_urls.extend(srcs)
                 
                 # Navigate to next subpage (if exists)
                 try:
-                    next_el = driver.find_element(By.CSS_SELECTOR, "a.next_page")
-                    href = next_el.get_attribute("href")
-                    if not href:
-                        href = next_el.get_attribute("href") or next_el.get_attribute("data-href")
+                    has_next, href, page_url = driver.execute_script(_NEXT_LINK_JS)
+                    if not has_next:
+                        print("✅ No more next subpages. Finished chapter.")
+                        break
                     if not href:
                         print("✅ No next link visible. Finished chapter subpages.")
                         break
 
-                    current_chapter_id = extract_chapter_id(driver.current_url)
-                    next_url = urljoin(driver.current_url, href)
+                    current_chapter_id = extract_chapter_id(page_url)
+                    next_url = urljoin(page_url, href)
                     next_chapter_id = extract_chapter_id(next_url)
 
                     if current_chapter_id and next_chapter_id and current_chapter_id != next_chapter_id:
@@ -173,16 +397,7 @@ def fetch_chapter_image_urls(chapter_url: str) -> List[str]:
                     print(f"➡️ Navigating to next subpage: {next_url}")
                     current_url = next_url # Update current_url for next iteration
                     subpage_idx += 1
-                    
-                    # Apply 10-sec delay and scroll to bottom, then reset to top
-                    print("Waiting 10 seconds and scrolling to bottom of new page...")
-                    time.sleep(10)
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    driver.execute_script("window.scrollTo(0, 0);")
-
-                except NoSuchElementException:
-                    print("✅ No more next subpages. Finished chapter.")
-                    break
+
                 except TimeoutException:
                     print("⚠️ Timeout while moving to next subpage; stopping image collection.")
                     break
@@ -191,26 +406,20 @@ def fetch_chapter_image_urls(chapter_url: str) -> List[str]:
                     break # Break on unexpected errors
 
             return img_urls
-        finally:
-            if driver:
-                driver.quit()
     else:
         # Existing logic for other domains
-        options = webdriver.ChromeOptions()
-        # options.add_argument("--headless=new")
-        options.page_load_strategy = "eager"
-        options.add_argument("--ignore-ssl-errors=true")
-        options.add_argument("--ignore-certificate-errors")
+        # Check if this is a vertical longstrip manhwa URL (pattern: /chapter/id1/id2/)
+        is_vertical_longstrip = "/chapter/" in chapter_url and len(chapter_url.split("/")) >= 6
         
-        driver = webdriver.Chrome(options=options)
-        driver.set_page_load_timeout(10)
-
-        try:
+        # /uu/ and /mh/ pages usually carry their image in the HTML, so try them without a browser first
+        if not is_vertical_longstrip and _is_mh_chapter_url(chapter_url):
+            http_urls = _scrape_mh_pages(chapter_url)
+            if http_urls:
+                return http_urls
+        
+        with EAGER_DRIVERS.acquire() as driver:
             driver.get(chapter_url)
             
-            # Check if this is a vertical longstrip manhwa URL (pattern: /chapter/id1/id2/)
-            is_vertical_longstrip = "/chapter/" in chapter_url and len(chapter_url.split("/")) >= 6
-            
             if is_vertical_longstrip:
                 # For vertical longstrip manhwa, fetch all images on the single page
                 # Wait 10 seconds for the page to load
@@ -231,24 +440,18 @@ def fetch_chapter_image_urls(chapter_url: str) -> List[str]:
                 ]
                 
                 found_images = set()  # Use set to avoid duplicates
-                for selector in selectors:
-                    try:
-                        img_elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                        for img in img_elements:
-                            img_url = img.get_attribute("src")
-                            if img_url and img_url not in found_images:
-                                # Filter for actual content images
-                                # Exclude UI elements like keyboard arrows
-                                alt_text = img.get_attribute("alt") or ""
-                                if (img_url.endswith(('.jpg', '.jpeg', '.png', '.webp')) and
-                                    "arrow" not in alt_text.lower() and
-                                    "icon" not in alt_text.lower() and
-                                    "button" not in alt_text.lower()):
-                                    img_urls.append(img_url)
-                                    found_images.add(img_url)
-                    except Exception:
-                        # Continue with next selector if one fails
-                        continue
+                # Read every (src, alt) pair in one round-trip instead of two RPCs per image
+                for img_url, alt_text in driver.execute_script(_IMG_SRC_ALT_JS, selectors):
+                    if img_url and img_url not in found_images:
+                        # Filter for actual content images
+                        # Exclude UI elements like keyboard arrows
+                        alt_text = (alt_text or "").lower()
+                        if (img_url.endswith(('.jpg', '.jpeg', '.png', '.webp')) and
+                            "arrow" not in alt_text and
+                            "icon" not in alt_text and
+                            "button" not in alt_text):
+                            img_urls.append(img_url)
+                            found_images.add(img_url)
             else: # For www.mangago.me (non-vertical longstrip)
                 # Determine the type of pagination
                 is_manhwa = "youhim" in chapter_url or "mangazone" in chapter_url
@@ -260,44 +463,8 @@ def fetch_chapter_image_urls(chapter_url: str) -> List[str]:
                     # If issues arise, they should be addressed separately.
                     pass
 
-                is_manhwa_uu_url = "/uu/" in chapter_url and "pg-" in chapter_url
-                is_manhwa_mh_url = "/mh/" in chapter_url and "/c" in chapter_url
-
-                if is_manhwa_uu_url or is_manhwa_mh_url:
-                    page_num = 1
-                    base_url = chapter_url
-
-                    # Determine the base URL and starting page number
-                    if is_manhwa_uu_url:
-                        match = re.search(r"(.*/pg-)\d+", chapter_url)
-                        if match:
-                            base_url = match.group(1)
-                        pg_match = re.search(r"pg-(\d+)", chapter_url)
-                        if pg_match:
-                            page_num = int(pg_match.group(1))
-                    elif is_manhwa_mh_url:
-                        # For /mh/ URLs, the base is up to the chapter
-                        match = re.search(r"(.*/c\d+/)", chapter_url)
-                        if match:
-                            base_url = match.group(1)
-                        pg_match = re.search(r"/c\d+/(\d+)", chapter_url)
-                        if pg_match:
-                            page_num = int(pg_match.group(1))
-
-                    while True:
-                        current_url = ""
-                        # Construct the URL for the current page
-                        if is_manhwa_uu_url:
-                            current_url = f"{base_url}{page_num}/"
-                        elif is_manhwa_mh_url:
-                            if page_num == 1 and not re.search(r"/c\d+/\d+", base_url):
-                                 current_url = base_url
-                            else:
-                                 current_url = f"{base_url}{page_num}/"
-
-                        if not current_url:
-                            break
-
+                if _is_mh_chapter_url(chapter_url):
+                    for page_num, current_url in _iter_mh_pages(chapter_url):
                         try:
                             if driver.current_url != current_url:
                                 driver.get(current_url)
@@ -310,8 +477,6 @@ def fetch_chapter_image_urls(chapter_url: str) -> List[str]:
                             if img_url:
                                 img_urls.append(img_url)
 
-                            page_num += 1
-
                         except TimeoutException:
                             break
                         except Exception as e:
@@ -330,24 +495,185 @@ def fetch_chapter_image_urls(chapter_url: str) -> List[str]:
                         # Fallback if pages can't be fetched
                         total_pages = 1
 
-                    for i in range(1, total_pages + 1):
-                        url = chapter_url if i == 1 else f"{chapter_url.rstrip('/')}/{i}/"
-                        if driver.current_url != url:
-                            driver.get(url)
-
-                        try:
-                            img = WebDriverWait(driver, 10).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, f"img#page{i}"))
-                            )
-                            img_url = img.get_attribute("src")
-                            if img_url:
-                                img_urls.append(img_url)
-                        except Exception:
-                            continue
+                    # Page 1 is already loaded in the driver, so read it directly
+                    page_srcs = {1: _wait_page_image(driver, 1)}
+
+                    # The remaining pages are plain HTML: fetch them concurrently over
+                    # httpx with the browser's cookies instead of one Chrome load each
+                    page_nums = list(range(2, total_pages + 1))
+                    page_urls = [f"{chapter_url.rstrip('/')}/{i}/" for i in page_nums]
+                    htmls = _fetch_pages_html(driver, page_urls)
+                    for i, page_url, html in zip(page_nums, page_urls, htmls):
+                        src = _extract_page_image(html, i) if html else None
+                        if not src:
+                            # Image src is populated by JS on this page; let Selenium render it
+                            try:
+                                driver.get(page_url)
+                                src = _wait_page_image(driver, i)
+                            except Exception:
+                                src = None
+                        page_srcs[i] = src
+
+                    img_urls.extend(src for _, src in sorted(page_srcs.items()) if src)
             
             return img_urls
-        finally:
-            driver.quit()
+
+
+def _is_mh_chapter_url(chapter_url: str) -> bool:
+    """
+    Check for the one-image-per-page /uu/.../pg-N/ and /mh/.../cN/ chapter URLs.
+    """
+    is_manhwa_uu_url = "/uu/" in chapter_url and "pg-" in chapter_url
+    is_manhwa_mh_url = "/mh/" in chapter_url and "/c" in chapter_url
+    return is_manhwa_uu_url or is_manhwa_mh_url
+
+
+def _iter_mh_pages(chapter_url: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page number, URL) for successive pages of a /uu/ or /mh/ chapter,
+    starting from the page `chapter_url` points at.
+    """
+    is_manhwa_uu_url = "/uu/" in chapter_url and "pg-" in chapter_url
+    page_num = 1
+    base_url = chapter_url
+
+    # Determine the base URL and starting page number
+    if is_manhwa_uu_url:
+        match = _RE_UU.search(chapter_url)
+        if match:
+            base_url = match.group(1)
+        pg_match = _RE_PG_NUM.search(chapter_url)
+        if pg_match:
+            page_num = int(pg_match.group(1))
+    else:
+        # For /mh/ URLs, the base is up to the chapter
+        match = _RE_MH.search(chapter_url)
+        if match:
+            base_url = match.group(1)
+        pg_match = _RE_MH_PAGE.search(chapter_url)
+        if pg_match:
+            page_num = int(pg_match.group(1))
+
+    while True:
+        if not is_manhwa_uu_url and page_num == 1 and not _RE_MH_PAGE.search(base_url):
+            yield page_num, base_url
+        else:
+            yield page_num, f"{base_url}{page_num}/"
+        page_num += 1
+
+
+def _scrape_mh_pages(chapter_url: str) -> Optional[List[str]]:
+    """
+    Walk a /uu/ or /mh/ chapter over plain HTTP, reading img#page{n} from each page's HTML.
+    Pages are fetched MH_PAGE_BATCH at a time, since the page count isn't known up front.
+    
+    Returns:
+        Optional[List[str]]: The image URLs, or None if a page couldn't be fetched or the
+        first page only fills in its image with JS.
+    """
+    session = get_default_session()
+    img_urls = []
+    pages = _iter_mh_pages(chapter_url)
+
+    while True:
+        batch = list(islice(pages, MH_PAGE_BATCH))
+        try:
+            responses = session.map_get([page_url for _, page_url in batch], headers={"Referer": chapter_url})
+        except httpx.HTTPError:
+            # One failed request fails the whole batch; keeping the earlier pages would truncate the chapter
+            return None
+
+        for (page_num, page_url), response in zip(batch, responses):
+            # Batches overshoot the last page, so a missing page or a redirect off it ends
+            # the chapter; server errors and throttling would cut it short, so leave those to Selenium
+            if img_urls and _is_past_chapter_end(page_url, response):
+                return img_urls
+            if not response.is_success:
+                return None
+            img = LexborHTMLParser(response.text).css_first(f"img#page{page_num}, img.page{page_num}")
+            src = img.attributes.get("src") if img else None
+            if not src:
+                # A page that loads without its image is past the end of the chapter
+                return img_urls or None
+            img_urls.append(urljoin(str(response.url), src))
+
+    return img_urls or None
+
+
+def _is_past_chapter_end(page_url: str, response: httpx.Response) -> bool:
+    """
+    Check whether a /uu/ or /mh/ page request went past the chapter's last page:
+    a client error other than 429, or a redirect to a different page.
+    """
+    if response.is_client_error:
+        return response.status_code != 429
+    return bool(response.history) and urlparse(str(response.url)).path != urlparse(page_url).path
+
+
+def _wait_page_image(driver: webdriver.Chrome, page_num: int) -> Optional[str]:
+    """
+    Wait for img#page{page_num} on the loaded page and return its src.
+    """
+    try:
+        img = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, f"img#page{page_num}"))
+        )
+        return img.get_attribute("src")
+    except Exception:
+        return None
+
+
+def _fetch_pages_html(driver: webdriver.Chrome, urls: List[str]) -> List[Optional[str]]:
+    """
+    Fetch several pages concurrently with httpx, reusing the driver's session.
+    
+    Args:
+        driver (webdriver.Chrome): Driver whose cookies and user agent are reused.
+        urls (List[str]): The page URLs to fetch.
+        
+    Returns:
+        List[Optional[str]]: The HTML of each page, or None where the request failed.
+    """
+    if not urls:
+        return []
+
+    cookies = {cookie["name"]: cookie["value"] for cookie in driver.get_cookies()}
+    headers = get_headers()
+    headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+    headers["Referer"] = driver.current_url
+
+    async def fetch_all() -> List[Optional[str]]:
+        async with httpx.AsyncClient(
+            http2=True,
+            headers=headers,
+            cookies=cookies,
+            timeout=20,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=8)
+        ) as client:
+            async def fetch(url: str) -> Optional[str]:
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    return response.text
+                except httpx.HTTPError:
+                    return None
+
+            return list(await asyncio.gather(*(fetch(url) for url in urls)))
+
+    return asyncio.run(fetch_all())
+
+
+def _extract_page_image(html: str, page_num: int) -> Optional[str]:
+    """
+    Extract the src of img#page{page_num} from raw page HTML.
+    """
+    img = LexborHTMLParser(html).css_first(f"img#page{page_num}")
+    if img:
+        src = img.attributes.get("src")
+        if src and src.startswith("http"):
+            return src
+    return None
 
 
 def get_chapter_list(driver: webdriver.Chrome) -> List[Chapter]:
@@ -356,7 +682,8 @@ def get_chapter_list(driver: webdriver.Chrome) -> List[Chapter]:
     Automatically clicks 'show all chapters' button if present.
     Handles different domains.
     """
-    parsed_url = urlparse(driver.current_url)
+    page_url = driver.current_url
+    parsed_url = urlparse(page_url)
     domain = parsed_url.netloc
     
     chapters = []
@@ -364,23 +691,23 @@ def get_chapter_list(driver: webdriver.Chrome) -> List[Chapter]:
     if domain in ["www.youhim.me", "www.mangago.zone"]:
         # For these domains, assume a simpler structure for chapter links.
         # This is a generic approach; might need refinement based on actual HTML.
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        tree = LexborHTMLParser(driver.page_source)
         
         # Look for common chapter link patterns
         # Example: <a> tags within a div or ul that might contain "chapter" in their href
-        chapter_links = soup.find_all('a', href=re.compile(r'/chapter/\d+/\d+/'))
-        
-        for link in chapter_links:
-            title = link.get_text(strip=True)
-            url = link.get('href')
+        for link in tree.css('a[href*="/chapter/"]'):
+            url = link.attributes.get('href')
+            if not url or not _RE_CH_HREF.search(url):
+                continue
+            title = link.text(strip=True)
 
-            if url and not url.startswith('http'):
-                url = urljoin(driver.current_url, url)
+            if not url.startswith('http'):
+                url = urljoin(page_url, url)
 
             # Try to extract chapter number from title or URL
             number = 0
-            match_title = re.search(r'Chapter\s*(\d+(\.\d+)?)', title, re.IGNORECASE)
-            match_url = re.search(r'/chapter/\d+/(\d+)/', url)
+            match_title = _RE_CH_TITLE.search(title)
+            match_url = _RE_CH_HREF_NUM.search(url)
 
             if match_title:
                 number = float(match_title.group(1))
@@ -408,23 +735,19 @@ def get_chapter_list(driver: webdriver.Chrome) -> List[Chapter]:
             # Some other error occurred, but we'll continue anyway
             pass
         
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        chapter_table = soup.find('table', class_='listing')
-        if not isinstance(chapter_table, Tag):
+        tree = LexborHTMLParser(driver.page_source)
+        chapter_table = tree.css_first('table.listing')
+        if chapter_table is None:
             raise DownloadError("Could not find chapter table.")
         
-        for row in chapter_table.find_all('tr'):
-            link = row.find('a', class_='chico')
-            if not link:
-                continue
-
-            title = link.get_text(strip=True)
-            url = link.get('href')
+        for link in chapter_table.css('tr a.chico'):
+            title = link.text(strip=True)
+            url = link.attributes.get('href')
 
             if url and not url.startswith('http'):
-                url = urljoin(driver.current_url, url)
+                url = urljoin(page_url, url)
 
-            match = re.search(r'Ch\.(\d+(\.\d+)?)', title)
+            match = _RE_CH.search(title)
             number = float(match.group(1)) if match else 0
             
             chapters.append(Chapter(number=int(number), title=title, url=url))
@@ -440,6 +763,133 @@ def close_driver(driver: webdriver.Chrome):
         except Exception:
             pass
 
+# Requests the eager driver never needs to make
+_BLOCKED_URL_PATTERNS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*googletagmanager.com*", "*google-analytics.com*",
+    "*doubleclick.net*", "*googlesyndication.com*",
+]
+
+def init_eager_driver() -> webdriver.Chrome:
+    """Create a Chrome driver using the 'eager' page load strategy."""
+    options = webdriver.ChromeOptions()
+    # options.add_argument("--headless=new")
+    options.page_load_strategy = "eager"
+    options.add_argument("--ignore-ssl-errors=true")
+    options.add_argument("--ignore-certificate-errors")
+    
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(10)
+    # Fonts and ad/analytics requests add load time without carrying anything we scrape.
+    # Images stay enabled: lazy loaders and the search cover wait rely on them loading.
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
+    return driver
+
+
+class DriverPool:
+    """
+    Keeps idle Chrome drivers so searches, detail pages and chapters can reuse
+    them instead of starting a browser for every call.
+    """
+    
+    def __init__(self, factory: Callable[[], webdriver.Chrome], max_idle: int = 5):
+        self.factory = factory
+        self._idle: "queue.Queue[webdriver.Chrome]" = queue.Queue(maxsize=max_idle)
+        self._drivers: List[webdriver.Chrome] = []
+        self._lock = threading.Lock()
+    
+    def get(self) -> webdriver.Chrome:
+        """
+        Take an idle driver whose browser is still alive, or start a new one.
+        The caller must hand it back with release().
+        """
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.current_url  # one cheap round-trip; fails once the browser is gone
+                return driver
+            except WebDriverException:
+                self.discard(driver)
+        
+        driver = self.factory()
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+    
+    @contextmanager
+    def acquire(self) -> Iterator[webdriver.Chrome]:
+        """
+        Borrow a driver for the duration of a with block.
+        A driver that raised a WebDriverException is quit instead of returned.
+        """
+        driver = self.get()
+        try:
+            yield driver
+        except WebDriverException:
+            self.discard(driver)
+            raise
+        except BaseException:
+            self.release(driver)
+            raise
+        self.release(driver)
+    
+    def owns(self, driver: webdriver.Chrome) -> bool:
+        with self._lock:
+            return driver in self._drivers
+    
+    def release(self, driver: webdriver.Chrome):
+        """Return a driver to the idle queue, quitting it if the queue is full."""
+        try:
+            self._idle.put_nowait(driver)
+        except queue.Full:
+            self.discard(driver)
+    
+    def discard(self, driver: webdriver.Chrome):
+        """Quit a driver and stop tracking it."""
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        close_driver(driver)
+    
+    def shutdown(self):
+        """Quit every driver created by this pool."""
+        with self._lock:
+            drivers = list(self._drivers)
+            self._drivers.clear()
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for driver in drivers:
+            close_driver(driver)
+
+
+SCROLL_DRIVERS = DriverPool(lambda: init_driver())
+EAGER_DRIVERS = DriverPool(lambda: init_eager_driver())
+
+
+def release_driver(driver: webdriver.Chrome):
+    """
+    Hand a driver from get_manga_details back to its pool.
+    Drivers that don't belong to a pool are quit.
+    """
+    for pool in (SCROLL_DRIVERS, EAGER_DRIVERS):
+        if pool.owns(driver):
+            pool.release(driver)
+            return
+    close_driver(driver)
+
+
+def shutdown_drivers():
+    """Quit all pooled drivers. Call once when the application exits."""
+    SCROLL_DRIVERS.shutdown()
+    EAGER_DRIVERS.shutdown()
+
 def init_driver():
     options = webdriver.ChromeOptions()
     options.add_argument("--non-headless=new")
@@ -456,15 +906,48 @@ def wait_first_image(driver, timeout=20):
         EC.presence_of_element_located((By.CSS_SELECTOR, "img[id^='page']"))
     )
 
+_SUBPAGE_IMAGES_JS = (
+    "const i = document.querySelectorAll(\"img[id^='page']\");"
+    "return [i.length, i.length > 0 && i[i.length - 1].naturalHeight > 0];"
+)
+
+# Whether a.next_page exists, its href (or data-href) and the current page URL, in one call
+_NEXT_LINK_JS = """
+    const a = document.querySelector("a.next_page");
+    return [a !== null, a ? (a.href || a.getAttribute("data-href")) : null, location.href];
+"""
+
+# (src, alt) of every image matched by each selector in arguments[0], in selector order
+_IMG_SRC_ALT_JS = """
+    return arguments[0].flatMap(sel => Array.from(document.querySelectorAll(sel), i => [i.src, i.alt]));
+"""
+
+# Unknown ids sort last, as page 1_000_000
+_SUBPAGE_SRCS_JS = """
+    const key = i => { const m = /page(\\d+)/.exec(i.id); return m ? parseInt(m[1], 10) : 1000000; };
+    return Array.from(document.querySelectorAll("img[id^='page']"))
+        .sort((a, b) => key(a) - key(b))
+        .map(i => i.src || i.dataset.src)
+        .filter(Boolean);
+"""
+
 def load_all_images_on_subpage(driver, initial_wait=10, pause=1.0, max_rounds=400, stable_rounds=3):
     """
     Scrolls in steps until the number of images stops increasing for `stable_rounds`.
     This reliably triggers lazy-loading on long vertical strips.
+    `initial_wait` and `pause` are upper bounds: each wait returns as soon as
+    new images are in the DOM and the last one has loaded.
+    Returns the image URLs ordered by their page id.
     """
     # start at top
     driver.execute_script("window.scrollTo(0, 0);")
-    # give scripts time to inject all <img> tags
-    time.sleep(initial_wait)
+    # wait for scripts to inject the first <img> tags
+    try:
+        WebDriverWait(driver, initial_wait, poll_frequency=0.2).until(
+            lambda d: d.execute_script(_SUBPAGE_IMAGES_JS)[0] >= 1
+        )
+    except TimeoutException:
+        pass
 
     prev_count = 0
     stable = 0
@@ -493,29 +976,26 @@ def load_all_images_on_subpage(driver, initial_wait=10, pause=1.0, max_rounds=40
             window.scrollBy(0, step);
         """)
 
-        time.sleep(pause)
+        _wait_for_more_images(driver, count, pause)
 
         # If we've seen no growth for a while, try one hard jump to bottom once
         if stable == stable_rounds - 1:
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(pause)
+            _wait_for_more_images(driver, count, pause)
 
         if stable >= stable_rounds:
             break
 
-    # Final collect
-    imgs = driver.find_elements(By.CSS_SELECTOR, "img[id^='page']")
-    return imgs
+    # Final collect: sort and read every src in one round-trip
+    return driver.execute_script(_SUBPAGE_SRCS_JS)
+
+def _wait_for_more_images(driver, count, timeout):
+    """Wait up to `timeout` seconds for more than `count` images with the last one loaded."""
+    def grown(d):
+        n, last_loaded = d.execute_script(_SUBPAGE_IMAGES_JS)
+        return n > count and last_loaded
 
-def sort_key_by_page_id(img_el):
-    # Extract number from id="page123"
     try:
-        pid = img_el.get_attribute("id") or ""
-        match = re.search(r"page(\d+)", pid)
-        if match:
-            n = int(match.group(1))
-            return n
-        else:
-            return 1_000_000 # fallback to push unknowns to end
-    except Exception:
-        return 1_000_000  # fallback to push unknowns to end
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(grown)
+    except TimeoutException:
+        pass
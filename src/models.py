@@ -1,11 +1,12 @@
 """
 Data models for the Mangago Downloader.
 """
+import os
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class Manga:
     """
     Represents a manga with its metadata.
@@ -30,7 +31,7 @@ class Manga:
         return self.title
 
 
-@dataclass
+@dataclass(slots=True)
 class Chapter:
     """
     Represents a manga chapter.
@@ -38,7 +39,26 @@ class Chapter:
     number: float  # Using float to handle chapters like 1.5, 2.0, etc.
     url: str
     title: Optional[str] = None
-    image_urls: List[str] = field(default_factory=list)
+    # Image URLs share a long CDN prefix, so it is stored once and each URL keeps only its tail
+    url_prefix: str = ""
+    image_tails: Tuple[str, ...] = ()
+    
+    @property
+    def image_urls(self) -> Tuple[str, ...]:
+        """
+        Full image URLs of the chapter.
+        
+        Returns:
+            Tuple[str, ...]: The URLs rebuilt from the shared prefix and tails.
+        """
+        prefix = self.url_prefix
+        return tuple(prefix + tail for tail in self.image_tails)
+    
+    @image_urls.setter
+    def image_urls(self, urls: Iterable[str]):
+        urls = list(urls)
+        self.url_prefix = os.path.commonprefix(urls)
+        self.image_tails = tuple(url[len(self.url_prefix):] for url in urls)
     
     def __str__(self) -> str:
         """
@@ -52,7 +72,7 @@ class Chapter:
         return f"Chapter {self.number}"
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """
     Represents a search result containing manga information.
@@ -70,7 +90,7 @@ class SearchResult:
         return f"{self.index}. {self.manga}"
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadResult:
     """
     Represents the result of a download operation.
@@ -1,111 +1,295 @@
 """
 Search functionality for the Mangago Downloader.
 """
+import asyncio
 import urllib.parse
 import re
+import threading
 import time
-from typing import List, Optional, Tuple
-from bs4 import BeautifulSoup, Tag
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import httpx
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from urllib.parse import urljoin, urlparse # Added urlparse
-from src.downloader import init_driver # Import init_driver
+from src.downloader import EAGER_DRIVERS, SCROLL_DRIVERS, release_driver
 
 from .models import Manga, SearchResult
-from .utils import SessionManager, NetworkError, ParsingError
+from .utils import AsyncSessionManager, SessionManager, NetworkError, ParsingError
 
 
 # Base URL for Mangago
 BASE_URL = "https://www.mangago.me/"
 SEARCH_URL = "https://www.mangago.me/r/l_search/"
 
+# Tags removed right after parsing; nothing in search or detail parsing reads them
+_UNUSED_TAGS = ["script", "style", "svg", "noscript", "iframe", "link", "meta"]
+
+# First number in a "latest chapter" label, e.g. "Ch.12.5"
+_RE_CHAPTER_NUMBER = re.compile(r'(\d+(\.\d+)?)')
+
+# True once the first (up to 10) search results have their lazy-loaded cover
+_COVERS_LOADED_JS = (
+    "return document.querySelectorAll('#search_list li img.loaded').length"
+    " >= Math.min(10, document.querySelectorAll('#search_list li').length);"
+)
+
+# The fields of every search result, read in the browser the same way _manga_item_fields
+# reads them (each text node stripped and joined, raw attribute values)
+_SEARCH_ITEMS_JS = """
+    const text = el => {
+        if (!el) return null;
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        let out = "", node;
+        while ((node = walker.nextNode())) out += node.data.trim();
+        return out;
+    };
+    const attr = (el, name) => el ? el.getAttribute(name) : null;
+    return Array.from(document.querySelectorAll("#search_list li"), li => {
+        const a = li.querySelector("h2 a");
+        return {
+            title: text(a),
+            url: attr(a, "href"),
+            author: text(li.querySelector(".row-3.gray")),
+            genres: text(li.querySelector(".row-4.blue .gray")),
+            chapter: text(li.querySelector(".row-5.gray a.chico")),
+            cover: attr(li.querySelector("img.loaded"), "src"),
+        };
+    });
+"""
+
+# Minimum gap between two search page requests, so concurrent searches don't hammer the site
+SEARCH_MIN_INTERVAL = 1.0
+
+# Recent search pages, keyed on (normalized query, page), oldest first
+SEARCH_CACHE_TTL = 600
+SEARCH_CACHE_SIZE = 256
+
+_search_cache: "OrderedDict[Tuple[str, int], Tuple[float, List[SearchResult]]]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+_search_rate_lock = threading.Lock()
+_next_search_time = 0.0
+
+
+def _wait_for_search_slot():
+    """
+    Block until at least SEARCH_MIN_INTERVAL has passed since the previous search request started.
+    """
+    global _next_search_time
+    with _search_rate_lock:
+        now = time.monotonic()
+        start = max(now, _next_search_time)
+        _next_search_time = start + SEARCH_MIN_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+
 
 def search_manga(query: str, page: int = 1) -> List[SearchResult]:
     """
-    Search for manga by title using the faster 'eager' page load strategy.
+    Search for manga by title.
+    The server-rendered result page is fetched over HTTP; Selenium is only used if that is refused.
+    Results are cached for SEARCH_CACHE_TTL seconds, so paging back and forth doesn't refetch.
     """
-    options = webdriver.ChromeOptions()
-    # options.add_argument("--headless=new")
-    options.page_load_strategy = "eager"
-    
-    driver = webdriver.Chrome(options=options)
-    driver.set_page_load_timeout(10)
+    key = (query.strip().casefold(), page)
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            _search_cache.move_to_end(key)
+            return list(entry[1])
 
-    try:
+    results = asyncio.run(search_manga_async(query, [page]))[0]
+
+    with _search_cache_lock:
+        _search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, results)
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+    return list(results)
+
+
+def _search_manga_selenium(query: str, page: int = 1) -> List[SearchResult]:
+    """
+    Search for manga by title using the faster 'eager' page load strategy.
+    The browser is borrowed from the shared driver pool rather than started per search.
+    """
+    with EAGER_DRIVERS.acquire() as driver:
         encoded_query = urllib.parse.quote_plus(query)
         search_url = f"{SEARCH_URL}?name={encoded_query}&page={page}"
+        _wait_for_search_slot()
         driver.get(search_url)
         
         WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "search_list")))
         
-        # Wait for images to lazy-load
-        time.sleep(5)
+        # Wait for cover images to lazy-load, but only until they are in
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        try:
+            WebDriverWait(driver, 8, poll_frequency=0.2).until(
+                lambda d: d.execute_script(_COVERS_LOADED_JS)
+            )
+        except TimeoutException:
+            pass
         
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        return _parse_search_results(soup)
-    finally:
-        driver.quit()
+        # Pull just the fields we need instead of serializing the whole DOM through page_source
+        return _build_search_results(driver.execute_script(_SEARCH_ITEMS_JS))
 
 
-def _parse_search_results(soup: BeautifulSoup) -> List[SearchResult]:
-    results = []
-    for index, li in enumerate(soup.select("#search_list li"), start=1):
-        try:
-            manga = _parse_manga_item(li)
-            if manga:
-                results.append(SearchResult(index=index, manga=manga))
-        except Exception as e:
-            print(f"Warning: Failed to parse a search result item: {e}")
-            continue
+def search_manga_pages(query: str, pages: List[int], max_workers: int = 4) -> List[List[SearchResult]]:
+    """
+    Fetch several search result pages concurrently in Selenium, each on its own pooled driver.
+    
+    Args:
+        query (str): The search query.
+        pages (List[int]): The result pages to fetch.
+        max_workers (int): Maximum number of browsers used at once.
+        
+    Returns:
+        List[List[SearchResult]]: The results of each page, in the order of `pages`.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pages)))) as executor:
+        return list(executor.map(lambda page: _search_manga_selenium(query, page), pages))
+
+
+async def _fetch_search_html(session: AsyncSessionManager, query: str, page: int) -> Optional[str]:
+    """
+    Fetch one server-rendered search page.
+    
+    Returns:
+        Optional[str]: The page HTML, or None if the request was refused or failed.
+    """
+    try:
+        response = await session.get(SEARCH_URL, params={"name": query, "page": page})
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    return response.text
+
+
+async def search_manga_async(query: str, pages: List[int], cookies: Optional[Dict[str, str]] = None) -> List[List[SearchResult]]:
+    """
+    Fetch several search pages concurrently over plain HTTP, without a browser.
+    Pages that are refused (e.g. a 403) or lack #search_list fall back to Selenium.
+    
+    Args:
+        query (str): The search query.
+        pages (List[int]): The result pages to fetch.
+        cookies (Optional[Dict[str, str]]): Cookies from a browser session, if available.
+        
+    Returns:
+        List[List[SearchResult]]: The results of each page, in the order of `pages`.
+    """
+    async with AsyncSessionManager(timeout=20, cookies=cookies) as session:
+        htmls = await asyncio.gather(*(_fetch_search_html(session, query, page) for page in pages))
+
+    results: List[Optional[List[SearchResult]]] = []
+    fallback_pages = []
+    for page, html in zip(pages, htmls):
+        tree = _parse_html(html) if html else None
+        if tree is None or tree.css_first("#search_list") is None:
+            results.append(None)
+            fallback_pages.append(page)
+        else:
+            results.append(_parse_search_results(tree))
+
+    if fallback_pages:
+        fallback_results = iter(await asyncio.to_thread(search_manga_pages, query, fallback_pages))
+        results = [page_results if page_results is not None else next(fallback_results) for page_results in results]
     return results
 
 
-def _parse_manga_item(item: Tag) -> Optional[Manga]:
-    title_tag = item.select_one("h2 a")
-    if not title_tag:
+def _parse_html(html: str) -> LexborHTMLParser:
+    """
+    Parse a page and drop the tags none of the selectors read, so later css() walks fewer nodes.
+    """
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(_UNUSED_TAGS)
+    return tree
+
+
+def _parse_search_results(tree: LexborHTMLParser) -> List[SearchResult]:
+    return _build_search_results(_manga_item_fields(li) for li in tree.css("#search_list li"))
+
+
+def _build_search_results(items: Iterable[Dict[str, Optional[str]]]) -> List[SearchResult]:
+    # Items that aren't a manga are skipped, so the shown indices stay contiguous
+    mangas = filter(None, (_parse_manga_item(fields) for fields in items))
+    return [SearchResult(index=index, manga=manga) for index, manga in enumerate(mangas, start=1)]
+
+
+def _attr(node: Optional[LexborNode], name: str) -> Optional[str]:
+    """
+    Get an attribute of a possibly missing node; empty or valueless attributes give None.
+    """
+    if node is None:
         return None
+    return node.attributes.get(name) or None
 
-    title = title_tag.get_text(strip=True)
-    url = title_tag.get("href")
 
-    if not title or not isinstance(url, str):
+def _manga_item_fields(item: LexborNode) -> Dict[str, Optional[str]]:
+    """
+    Read the raw text and attributes of one search result, matching _SEARCH_ITEMS_JS.
+    Server HTML hasn't been through the lazy loader yet, so the cover is read from
+    the img's data-src/data-original before falling back to src.
+    """
+    title_tag = item.css_first("h2 a")
+    author = item.css_first(".row-3.gray")
+    genres = item.css_first(".row-4.blue .gray")
+    latest_chapter_tag = item.css_first(".row-5.gray a.chico")
+    cover_img_tag = item.css_first("img")
+    return {
+        "title": title_tag.text(strip=True) if title_tag else None,
+        "url": _attr(title_tag, "href"),
+        "author": author.text(strip=True) if author else None,
+        "genres": genres.text(strip=True) if genres else None,
+        "chapter": latest_chapter_tag.text(strip=True) if latest_chapter_tag else None,
+        "cover": (_attr(cover_img_tag, "data-src") or _attr(cover_img_tag, "data-original")
+                  or _attr(cover_img_tag, "src")),
+    }
+
+
+def _parse_manga_item(fields: Dict[str, Optional[str]]) -> Optional[Manga]:
+    """
+    Build a Manga from one search result's fields; returns None instead of raising.
+    """
+    title = fields.get("title")
+    url = fields.get("url")
+
+    if not title or not url:
         return None
         
     if url.startswith('/'):
         url = urljoin(BASE_URL, url)
 
-    manga = Manga(title=title, url=url)
+    author_text = (fields.get("author") or "").replace("Author:", "").strip()
 
-    author_text = (author.get_text(strip=True) if (author := item.select_one(".row-3.gray")) else "").replace("Author:", "").strip()
-    manga.author = author_text
+    genres_text = fields.get("genres") or ""
+    genres = [g.strip() for g in genres_text.split(',') if g.strip()]
 
-    genres_text = (genres.get_text(strip=True) if (genres := item.select_one(".row-4.blue .gray")) else "")
-    manga.genres = [g.strip() for g in genres_text.split(',') if g.strip()]
+    total_chapters = 0
+    chapter_text = fields.get("chapter")
+    if chapter_text is not None:
+        match = _RE_CHAPTER_NUMBER.search(chapter_text)
+        total_chapters = int(float(match.group(1))) if match else 0
 
-    latest_chapter_tag = item.select_one(".row-5.gray a.chico")
-    if latest_chapter_tag:
-        chapter_text = latest_chapter_tag.get_text(strip=True)
-        match = re.search(r'(\d+(\.\d+)?)', chapter_text)
-        manga.total_chapters = int(float(match.group(1))) if match else 0
-    else:
-        manga.total_chapters = 0
-
-    cover_img_tag = item.select_one("img.loaded")
-    if cover_img_tag:
-        src = cover_img_tag.get("src")
-        if isinstance(src, str):
-            manga.cover_image_url = src
-
-    return manga
+    return Manga(
+        title=title,
+        url=url,
+        author=author_text,
+        genres=genres,
+        total_chapters=total_chapters,
+        cover_image_url=fields.get("cover") or None,
+    )
 
 
 def get_manga_details(manga_url: str) -> Tuple[Manga, webdriver.Chrome]:
     """
     Get detailed manga info using the 'eager' page load strategy.
-    The WebDriver instance is returned for reuse.
+    The WebDriver instance is returned for reuse; pass it to release_driver() when done.
     Handles different domains.
     """
     parsed_url = urlparse(manga_url)
@@ -114,13 +298,9 @@ def get_manga_details(manga_url: str) -> Tuple[Manga, webdriver.Chrome]:
     driver = None
     try:
         if domain in ["www.youhim.me", "www.mangago.zone"]:
-            driver = init_driver() # Use the common init_driver
+            driver = SCROLL_DRIVERS.get()
         else:
-            options = webdriver.ChromeOptions()
-            # options.add_argument("--headless=new")
-            options.page_load_strategy = "eager"
-            driver = webdriver.Chrome(options=options)
-            driver.set_page_load_timeout(10)
+            driver = EAGER_DRIVERS.get()
         
         driver.get(manga_url)
         # For mangago.me, wait for element with ID "page". For other domains, this might be different.
@@ -133,61 +313,69 @@ def get_manga_details(manga_url: str) -> Tuple[Manga, webdriver.Chrome]:
             # For other domains, just wait for the page to be loaded enough
             WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
         
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        manga = _parse_manga_details(soup, manga_url)
+        tree = _parse_html(driver.page_source)
+        manga = _parse_manga_details(tree, manga_url)
         
         return manga, driver
     except Exception as e:
         if driver:
-            driver.quit()
+            release_driver(driver)
         raise ParsingError(f"Failed to get manga details for {manga_url}: {e}")
 
 
-def _parse_manga_details(soup: BeautifulSoup, manga_url: str) -> Manga:
-    title = (title_elem.get_text(strip=True) if (title_elem := soup.find('h1')) else "Unknown Title")
+def _set_author(row: LexborNode, manga: Manga):
+    author_link = row.css_first("a")
+    if author_link:
+        manga.author = author_link.text(strip=True)
+
+
+def _set_genres(row: LexborNode, manga: Manga):
+    genre_links = row.css("a")
+    if genre_links:
+        manga.genres = [link.text(strip=True) for link in genre_links]
+
+
+# Details table rows we read, keyed on their label without the trailing colon
+_DETAIL_ROW_HANDLERS = {
+    "Author": _set_author,
+    "Genre(s)": _set_genres,
+}
+
+
+def _parse_manga_details(tree: LexborHTMLParser, manga_url: str) -> Manga:
+    title = (title_elem.text(strip=True) if (title_elem := tree.css_first('h1')) else "Unknown Title")
     manga = Manga(title=title, url=manga_url)
 
     # Cover Image
-    cover_div = soup.select_one("div.left.cover")
-    if isinstance(cover_div, Tag):
-        cover_elem = cover_div.find("img")
-        if isinstance(cover_elem, Tag) and cover_elem.get("src"):
-            src = cover_elem.get("src")
-            if isinstance(src, str):
-                manga.cover_image_url = src
+    src = _attr(tree.css_first("div.left.cover img"), "src")
+    if src:
+        manga.cover_image_url = src
 
     # Details table
-    details_table = soup.select_one("div.manga_right table")
-    if isinstance(details_table, Tag):
-        # Find all table rows and process them
-        rows = details_table.find_all("tr")
-        for row in rows:
-            label_tag = row.find("label")
-            if not isinstance(label_tag, Tag):
-                continue
-
-            label_text = label_tag.get_text(strip=True)
-            
-            # Author
-            if "Author:" in label_text:
-                author_link = row.find("a")
-                if isinstance(author_link, Tag):
-                    manga.author = author_link.get_text(strip=True)
-            
-            # Genres
-            elif "Genre(s):" in label_text:
-                genre_links = row.find_all("a")
-                if genre_links:
-                    manga.genres = [link.get_text(strip=True) for link in genre_links]
+    details_table = tree.css_first("div.manga_right table")
+    if details_table:
+        # One lookup per row, keyed on the row's label
+        for row in details_table.css("tr"):
+            label_tag = row.css_first("label")
+            handler = _DETAIL_ROW_HANDLERS.get(label_tag.text(strip=True).rstrip(":")) if label_tag else None
+            if handler:
+                handler(row, manga)
     
     # Summary
-    summary_div = soup.select_one("div.manga_summary")
-    if isinstance(summary_div, Tag):
-        # Remove the "Expand" button text
-        expand_button = summary_div.find("div", class_="expand")
-        if isinstance(expand_button, Tag):
-            expand_button.decompose()
+    summary_div = tree.css_first("div.manga_summary")
+    if summary_div:
+        summary = summary_div.text(strip=True)
+        # Remove the "Expand" button text; it normally comes last, so slice it off
+        # rather than mutating the tree
+        expand_button = summary_div.css_first("div.expand")
+        if expand_button:
+            button_text = expand_button.text(strip=True)
+            if summary.endswith(button_text):
+                summary = summary[:len(summary) - len(button_text)]
+            else:
+                expand_button.decompose()
+                summary = summary_div.text(strip=True)
         
-        manga.summary = summary_div.get_text(strip=True)
+        manga.summary = summary
 
-    return manga
\ No newline at end of file
+    return manga
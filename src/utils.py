@@ -1,13 +1,48 @@
 """
 Utility functions and constants for the Mangago Downloader.
 """
+import asyncio
+import atexit
+import functools
+import logging
 import os
 import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+from urllib.parse import urlsplit
 import httpx
 from httpx import Response
 
+# httpx can only decode Brotli responses when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        _ACCEPT_ENCODING = "gzip, deflate"
+
+logger = logging.getLogger(__name__)
+
+# Optional on-disk HTTP cache for page requests
+try:
+    from hishel import SyncSqliteStorage
+    from hishel.httpx import SyncCacheTransport
+except ImportError:
+    SyncCacheTransport = None
+
+HTTP_CACHE_PATH = Path.home() / ".cache" / "mangago" / "http_cache.db"
+
+# Seconds a cached response is kept before hishel evicts it, so the cache file stays bounded
+HTTP_CACHE_TTL = 24 * 60 * 60
+
 
 # User agents for requests to avoid blocking
 USER_AGENTS = [
@@ -22,7 +57,7 @@ USER_AGENTS = [
 DEFAULT_HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
     "Accept-Language": "en-US,en;q=0.9",
-    "Accept-Encoding": "gzip, deflate, br",
+    "Accept-Encoding": _ACCEPT_ENCODING,
     "Connection": "keep-alive",
     "Upgrade-Insecure-Requests": "1",
     "Sec-Fetch-Dest": "document",
@@ -35,6 +70,44 @@ DEFAULT_HEADERS = {
 }
 
 
+# Seconds an idle connection is kept for reuse. httpx defaults to 5s, which drops connections
+# between chapters; 75s matches nginx's default keepalive_timeout.
+KEEPALIVE_EXPIRY = 75.0
+
+
+# Dedicated generator and tuple for user agent picks
+_RNG = random.Random()
+_USER_AGENTS = tuple(USER_AGENTS)
+
+
+# Responses worth retrying, and how many attempts a request gets in total
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_ATTEMPTS = 4
+
+# Requests a session manager lets run against one host at a time, across every chapter
+# sharing it. mangago and its image CDN answer bursts with 429s, which cost more in
+# backoff than the extra parallelism gains.
+MAX_INFLIGHT_PER_HOST = 16
+
+
+def retry_delay(attempt: int, response: Optional[Response] = None) -> float:
+    """
+    Get how long to wait before retrying a request.
+    
+    Args:
+        attempt (int): The zero-based attempt that just failed.
+        response (Optional[Response]): The failed response, if the server sent one.
+        
+    Returns:
+        float: The server's Retry-After in seconds if given, else exponential backoff (capped at 10s).
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+    return min(0.5 * 2 ** attempt, 10.0)
+
+
 def get_random_user_agent() -> str:
     """
     Get a random user agent from the list.
@@ -42,7 +115,7 @@ def get_random_user_agent() -> str:
     Returns:
         str: A randomly selected user agent string.
     """
-    return random.choice(USER_AGENTS)
+    return _RNG.choice(_USER_AGENTS)
 
 
 def get_headers() -> Dict[str, str]:
@@ -52,30 +125,60 @@ def get_headers() -> Dict[str, str]:
     Returns:
         Dict[str, str]: Headers dictionary with user agent.
     """
-    headers = DEFAULT_HEADERS.copy()
-    headers["User-Agent"] = get_random_user_agent()
-    return headers
+    return {**DEFAULT_HEADERS, "User-Agent": get_random_user_agent()}
 
 
 class SessionManager:
     """
     Manages HTTP sessions for making requests.
+    The session's headers, including its user agent, are fixed when it is created;
+    requests should only pass the headers they need to change, such as Referer.
     """
     
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, max_connections: int = 256, max_keepalive: int = 64, cache: bool = True,
+                 max_inflight: int = MAX_INFLIGHT_PER_HOST):
         """
         Initialize the session manager.
         
         Args:
             timeout (int): Request timeout in seconds.
+            max_connections (int): Maximum number of open connections.
+            max_keepalive (int): Maximum number of idle connections kept for reuse.
+            cache (bool): Cache responses on disk per their Cache-Control headers, if hishel is installed.
+            max_inflight (int): Maximum number of concurrent requests to any one host.
         """
         self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_inflight = max_inflight
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+        transport = httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            )
+        )
+        if cache and SyncCacheTransport is not None:
+            HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            transport = SyncCacheTransport(
+                transport,
+                storage=SyncSqliteStorage(database_path=HTTP_CACHE_PATH, default_ttl=HTTP_CACHE_TTL)
+            )
         self.session = httpx.Client(
             headers=get_headers(),
             timeout=timeout,
-            follow_redirects=True
+            follow_redirects=True,
+            transport=transport
         )
     
+    def __enter__(self) -> "SessionManager":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def get(self, url: str, **kwargs) -> Response:
         """
         Make a GET request.
@@ -87,7 +190,38 @@ class SessionManager:
         Returns:
             Response: The HTTP response.
         """
-        return self.session.get(url, **kwargs)
+        # Transient network errors, 429s and 5xx responses are retried with backoff
+        for attempt in range(RETRY_ATTEMPTS):
+            last_attempt = attempt == RETRY_ATTEMPTS - 1
+            try:
+                with self._host_slot(url):
+                    response = self.session.get(url, **kwargs)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                time.sleep(retry_delay(attempt))
+                continue
+            if last_attempt or response.status_code not in RETRY_STATUSES:
+                return response
+            time.sleep(retry_delay(attempt, response))
+    
+    def map_get(self, urls: List[str], max_workers: int = 32, **kwargs) -> List[Response]:
+        """
+        Make several GET requests concurrently from a thread pool.
+        
+        Args:
+            urls (List[str]): The URLs to request.
+            max_workers (int): Maximum number of requests in flight, capped at the pool's connection limit.
+            **kwargs: Additional arguments to pass to each request.
+            
+        Returns:
+            List[Response]: The HTTP responses, in the same order as `urls`.
+        """
+        if not urls:
+            return []
+        workers = min(max_workers, self.max_connections, len(urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda url: self.get(url, **kwargs), urls))
     
     def post(self, url: str, **kwargs) -> Response:
         """
@@ -100,7 +234,34 @@ class SessionManager:
         Returns:
             Response: The HTTP response.
         """
-        return self.session.post(url, **kwargs)
+        with self._host_slot(url):
+            return self.session.post(url, **kwargs)
+    
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """
+        Get the semaphore limiting concurrent requests to the host of `url`.
+        Held only while a request is in flight, not during retry backoff.
+        """
+        host = urlsplit(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_inflight)
+            return slot
+    
+    def stream(self, method: str, url: str, **kwargs):
+        """
+        Make a streaming request, to be used as a context manager.
+        
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to request.
+            **kwargs: Additional arguments to pass to the request.
+            
+        Returns:
+            A context manager yielding the streamed Response.
+        """
+        return self.session.stream(method, url, **kwargs)
     
     def close(self):
         """
@@ -109,24 +270,187 @@ class SessionManager:
         self.session.close()
 
 
-def create_directory(path: str) -> bool:
+# Process-wide session, so every page request shares one connection pool
+_default_session: Optional[SessionManager] = None
+_default_session_lock = threading.Lock()
+
+
+def get_default_session() -> SessionManager:
+    """
+    Get the process-wide SessionManager, creating it on first use.
+    It is closed automatically when the interpreter exits.
+    
+    Returns:
+        SessionManager: The shared session.
+    """
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = SessionManager()
+            atexit.register(_default_session.close)
+        return _default_session
+
+
+class AsyncSessionManager:
+    """
+    Manages an asynchronous HTTP session, so many requests can run concurrently on one event loop.
+    """
+    
+    def __init__(self, timeout: int = 30, headers: Optional[Dict[str, str]] = None,
+                 max_connections: int = 256, max_keepalive: int = 64,
+                 max_inflight: int = MAX_INFLIGHT_PER_HOST, **client_kwargs: Any):
+        """
+        Initialize the session manager.
+        
+        Args:
+            timeout (int): Request timeout in seconds.
+            headers (Optional[Dict[str, str]]): Session headers; defaults to get_headers().
+            max_connections (int): Maximum number of open connections.
+            max_keepalive (int): Maximum number of idle connections kept for reuse.
+            max_inflight (int): Maximum number of concurrent requests to any one host.
+            **client_kwargs: Additional arguments for httpx.AsyncClient, e.g. cookies.
+        """
+        self.timeout = timeout
+        self.max_inflight = max_inflight
+        # Only touched from the session's event loop, so no lock is needed
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            ),
+            socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+        )
+        self.session = httpx.AsyncClient(
+            headers=get_headers() if headers is None else headers,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=transport,
+            **client_kwargs
+        )
+    
+    async def __aenter__(self) -> "AsyncSessionManager":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def get(self, url: str, **kwargs) -> Response:
+        """
+        Make a GET request.
+        
+        Args:
+            url (str): The URL to request.
+            **kwargs: Additional arguments to pass to the request.
+            
+        Returns:
+            Response: The HTTP response.
+        """
+        async def send() -> Response:
+            async with self._host_slot(url):
+                return await self.session.get(url, **kwargs)
+
+        return await self.send_with_retries(send)
+    
+    async def send_with_retries(self, send: Callable[[], Awaitable[Response]]) -> Response:
+        """
+        Run a request, retrying transient network errors, 429s and 5xx responses with backoff.
+        
+        Args:
+            send (Callable[[], Awaitable[Response]]): Makes one attempt at the request. Streaming
+                callers read the body inside it, so a connection dropped mid-body is retried too.
+            
+        Returns:
+            Response: The last attempt's response.
+        """
+        for attempt in range(RETRY_ATTEMPTS):
+            last_attempt = attempt == RETRY_ATTEMPTS - 1
+            try:
+                response = await send()
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                await asyncio.sleep(retry_delay(attempt))
+                continue
+            if last_attempt or response.status_code not in RETRY_STATUSES:
+                return response
+            await asyncio.sleep(retry_delay(attempt, response))
+    
+    async def post(self, url: str, **kwargs) -> Response:
+        """
+        Make a POST request.
+        
+        Args:
+            url (str): The URL to request.
+            **kwargs: Additional arguments to pass to the request.
+            
+        Returns:
+            Response: The HTTP response.
+        """
+        async with self._host_slot(url):
+            return await self.session.post(url, **kwargs)
+    
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[Response]:
+        """
+        Make a streaming request, to be used as an async context manager.
+        The host's request slot is held until the body has been read.
+        
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to request.
+            **kwargs: Additional arguments to pass to the request.
+            
+        Yields:
+            Response: The streamed response.
+        """
+        async with self._host_slot(url):
+            async with self.session.stream(method, url, **kwargs) as response:
+                yield response
+    
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        """
+        Get the semaphore limiting concurrent requests to the host of `url`.
+        Held only while a request is in flight, not during retry backoff.
+        """
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_inflight)
+        return slot
+    
+    async def close(self):
+        """
+        Close the session.
+        """
+        await self.session.aclose()
+
+
+def create_directory(path: Union[str, Path]) -> bool:
     """
     Create a directory if it doesn't exist.
     
     Args:
-        path (str): The path to create.
+        path (Union[str, Path]): The path to create.
         
     Returns:
         bool: True if directory was created or already exists, False otherwise.
     """
     try:
-        Path(path).mkdir(parents=True, exist_ok=True)
+        os.makedirs(path, exist_ok=True)
         return True
     except Exception as e:
-        print(f"Error creating directory {path}: {e}")
+        logger.error("Error creating directory %s: %s", path, e)
         return False
 
 
+# Characters that aren't allowed in file names, all mapped to "_"
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize a filename by removing invalid characters.
@@ -137,16 +461,9 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: The sanitized filename.
     """
-    # Remove invalid characters for file names
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    
-    # Limit filename length (255 is a common filesystem limit)
-    if len(filename) > 255:
-        filename = filename[:255]
-    
-    return filename.strip()
+    # Replace invalid characters for file names in a single pass, then
+    # limit the length (255 is a common filesystem limit)
+    return filename.translate(_SANITIZE_TABLE)[:255].strip()
 
 
 def get_file_size(filepath: str) -> Optional[int]:
@@ -165,6 +482,10 @@ def get_file_size(filepath: str) -> Optional[int]:
         return None
 
 
+# Units used by format_file_size, each 1024 times the last
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size in human readable format.
@@ -178,14 +499,9 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    size_float = float(size_bytes)
-    while size_float >= 1024.0 and i < len(size_names) - 1:
-        size_float /= 1024.0
-        i += 1
-    
-    return f"{size_float:.1f} {size_names[i]}"
+    # Each unit is 10 more bits, so the bit length picks the unit without a division loop
+    i = min((abs(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 
 # Error handling utilities
@@ -0,0 +1,33 @@
+"""
+Tests for parsing search results from server-rendered HTML.
+"""
+from pathlib import Path
+
+from src.search import _parse_html, _parse_search_results
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _search_results():
+    html = (FIXTURES / "search_page.html").read_text(encoding="utf-8")
+    return _parse_search_results(_parse_html(html))
+
+
+def test_covers_are_read_from_lazy_load_attributes():
+    covers = [result.manga.cover_image_url for result in _search_results()]
+    assert covers == [
+        "https://i.mangapicgallery.com/cover/first.jpg",
+        "https://i.mangapicgallery.com/cover/second.jpg",
+        "https://i.mangapicgallery.com/cover/third.jpg",
+    ]
+
+
+def test_results_keep_their_other_fields():
+    first, second, third = _search_results()
+    assert [first.index, second.index, third.index] == [1, 2, 3]
+    assert first.manga.title == "First Manga"
+    assert first.manga.author == "Someone"
+    assert first.manga.genres == ["Romance", "Drama"]
+    assert first.manga.total_chapters == 12
+    assert second.manga.url == "https://www.mangago.me/read-manga/second_manga/"
+    assert second.manga.total_chapters == 3